@@ -3,15 +3,16 @@ Actual instantiations of various bases in the DES-ECS core.
 """
 
 import dataclasses
-import enum
+import heapq
 import random
 
+import numpy as np
 import simpy
 
-from des_ecs import Component, ComponentDict, ComponentManager, System, World
+from des_ecs import Component, ComponentManager, System, World
 
 
-@dataclasses.dataclass(kw_only=True)
+@dataclasses.dataclass(kw_only=True, slots=True)
 class Position(Component):
     """
     A position component for a vehicle.
@@ -21,25 +22,32 @@ class Position(Component):
     y: float = 0
 
 
-class CommandState(enum.Enum):
-    """
-    The state of a commandable entity.
-    """
+# Command states, kept as plain ints so they pack into an int8 SoA column and compare as
+# numbers in both the scalar and vectorized paths.
+IDLING = 0
+INCOMING = 1
+EXECUTING = 2
 
-    IDLING = enum.auto()
-    EXECUTING = enum.auto()
+# Movement cutoff as an FP32 scalar, so comparing against the float32 SoA deltas never promotes
+# the whole expression to float64.
+MOVE_THRESHOLD = np.float32(1e-2)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Commandable(Component):
     """
-    Component that indicates an entity may receive commands.
+    Component that indicates an entity may receive commands.  The pending move deltas live
+    directly on the component: the lifecycle (idle -> incoming -> executing) is already encoded
+    in `state`, so a command is two field writes and a state flip rather than wrapper objects
+    shuffled between component dictionaries.
     """
 
-    state: CommandState = CommandState.IDLING
+    state: int = IDLING
+    pending_dx: float = 0.0
+    pending_dy: float = 0.0
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Destination(Component):
     """
     A destination for an entity.
@@ -49,34 +57,6 @@ class Destination(Component):
     y: float
 
 
-@dataclasses.dataclass
-class MoveCommand:
-    """
-    Commands a vehicle to change its position.
-    """
-
-    delta_x: float = 0
-    delta_y: float = 0
-
-
-@dataclasses.dataclass
-class IncomingCommand(Component):
-    """
-    An incoming `MoveCommand` for an entity.
-    """
-
-    command: MoveCommand
-
-
-@dataclasses.dataclass
-class ExecutingCommand(Component):
-    """
-    The `MoveCommand` that is currently being executed.
-    """
-
-    command: MoveCommand
-
-
 class MoveCommandSystem(System):  # pylint: disable=too-few-public-methods
     """
     Command issuing system.  For entities that are `Commandable` and have `RailPosition`s.
@@ -87,37 +67,73 @@ class MoveCommandSystem(System):  # pylint: disable=too-few-public-methods
     def update(
         self, env: simpy.Environment, component_manager: ComponentManager
     ) -> None:
-        # Iterate over all commandable entities.
-        for entity, components in component_manager.get_components(
-            component_types=self.required_components
-        ):
-            if components.get(Commandable).state == CommandState.IDLING:
-                x, y = (
-                    components.get(Position).x,
-                    components.get(Position).y,
-                )
-                dest_x, dest_y = (
-                    components.get(Destination).x,
-                    components.get(Destination).y,
-                )
-                delta_x, delta_y = (dest_x - x) / 2, (dest_y - y) / 2
-                if max(abs(delta_x), abs(delta_y)) > 1e-2:
-                    component_manager.add_components(
-                        entity,
-                        [
-                            IncomingCommand(
-                                MoveCommand(delta_x=delta_x, delta_y=delta_y)
-                            )
-                        ],
-                    )
+        try:
+            entities, entity_array, slots = self.query_slots(component_manager)
+        except KeyError:
+            # Fall back to scalar iteration when the components are not SoA-registered.
+            self._update_scalar(component_manager)
+            return
+        if not entities:
+            return
+
+        # One vectorized pass over the contiguous arrays replaces the per-entity scalar loop:
+        # compute the half-deltas, mask down to idle entities still far from their destination,
+        # and write the pending command straight into the Commandable columns.
+        position = component_manager.get_soa(Position)
+        destination = component_manager.get_soa(Destination)
+        commandable = component_manager.get_soa(Commandable)
+        pos_slots, dest_slots = slots[Position], slots[Destination]
+        cmd_slots = slots[Commandable]
+
+        delta_x = (destination.arrays["x"][dest_slots] - position.arrays["x"][pos_slots]) * 0.5
+        delta_y = (destination.arrays["y"][dest_slots] - position.arrays["y"][pos_slots]) * 0.5
+        idling = commandable.arrays["state"][cmd_slots] == IDLING
+        mask = idling & (np.maximum(np.abs(delta_x), np.abs(delta_y)) > MOVE_THRESHOLD)
+        if not mask.any():
+            return
+
+        active = cmd_slots[mask]
+        commandable.arrays["pending_dx"][active] = delta_x[mask]
+        commandable.arrays["pending_dy"][active] = delta_y[mask]
+        commandable.arrays["state"][active] = INCOMING
+        # Direct array writes bypass the proxy setters, so mark the entities dirty here.
+        commandable.dirty.update(entity_array[mask].tolist())
+
+    def _update_scalar(self, component_manager: ComponentManager) -> None:
+        """
+        Per-entity fallback used when the required components are not stored as arrays.
+        """
+        for entity, components in self.iter_components(component_manager):
+            commandable = components[Commandable]
+            if commandable.state == IDLING:
+                position = components[Position]
+                destination = components[Destination]
+                delta_x = (destination.x - position.x) / 2
+                delta_y = (destination.y - position.y) / 2
+                if max(abs(delta_x), abs(delta_y)) > MOVE_THRESHOLD:
+                    commandable.pending_dx = delta_x
+                    commandable.pending_dy = delta_y
+                    commandable.state = INCOMING
+                    # Plain-object writes are invisible to the recorder otherwise.
+                    component_manager.mark_dirty(entity)
 
 
 class CommandExecutionSystem(System):
     """
-    Command execution system.  For `Commandable` entities with an `IncomingCommand`.
+    Command execution system.  For `Commandable` entities with a pending incoming command.
     """
 
-    required_components = (Commandable, IncomingCommand, Position)
+    required_components = (Commandable, Position)
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Completion wheel: a single min-heap of (finish time, entity, batch event) entries
+        # served by one long-lived process, instead of spawning a simpy process plus timeout per
+        # command.  Each update's entries share a batch event, mirroring the per-batch any_of
+        # the loop used to wait on.
+        self._heap: list[tuple[float, int, simpy.Event]] = []
+        self._new_work: simpy.Event | None = None
+        self._wheel_started = False
 
     def update(
         self, env: simpy.Environment, component_manager: ComponentManager
@@ -125,65 +141,74 @@ class CommandExecutionSystem(System):
         """
         Transitions all commandable entities with an incoming command
         """
-        shared_events = []
-        for entity, components in component_manager.get_components(
-            self.required_components
-        ):
-            # Copy the command rom `Incoming` to `Executing`
-            self.entity_startup(entity, components, component_manager)
-            # Create a timeout event that will trigger when the command is about to finish.
-            completion_event = env.timeout(delay=random.random())
-
-            shared_events.append(
-                env.process(
-                    self.entity_cleanup(
-                        completion_event, entity, components, component_manager
-                    )
-                )
+        if not self._wheel_started:
+            # Lazily start the wheel once the environment is known.
+            self._wheel_started = True
+            self._new_work = env.event()
+            env.process(self._wheel(env, component_manager))
+
+        try:
+            _, entity_array, slots = self.query_slots(component_manager)
+        except KeyError:
+            incoming = [
+                entity
+                for entity, components in self.iter_components(component_manager)
+                if components[Commandable].state == INCOMING
+            ]
+        else:
+            commandable = component_manager.get_soa(Commandable)
+            incoming = entity_array[
+                commandable.arrays["state"][slots[Commandable]] == INCOMING
+            ].tolist()
+
+        batch_event = None
+        for entity in incoming:
+            # Flip the command to executing and schedule its completion.
+            if batch_event is None:
+                batch_event = env.event()
+            component_manager.get_entity(entity)[Commandable].state = EXECUTING
+            component_manager.mark_dirty(entity)
+            heapq.heappush(
+                self._heap, (env.now + random.random(), entity, batch_event)
             )
-        if shared_events:
-            return env.any_of(shared_events)
-        return None
-
-    def entity_startup(
-        self,
-        entity: int,
-        components: ComponentDict,
-        component_manager: ComponentManager,
-    ):
+
+        if batch_event is not None and not self._new_work.triggered:
+            self._new_work.succeed()
+        return batch_event
+
+    def _wheel(self, env: simpy.Environment, component_manager: ComponentManager):
         """
-        Commands for initial processing of the entity's components.
+        The single completion process.  Sleeps until the earliest scheduled finish, completes
+        every command that is due, and signals the main loop once per batch.
         """
-        component_manager.add_components(
-            entity, [ExecutingCommand(command=components.get(IncomingCommand).command)]
-        )
-        component_manager.remove_components(entity, [IncomingCommand])
-        components.get(Commandable).state = CommandState.EXECUTING
-
-    def entity_cleanup(
-        self,
-        triggered_event: simpy.Event,
-        entity: int,
-        components: ComponentDict,
-        component_manager: ComponentManager,
-    ):
+        while True:
+            while not self._heap:
+                self._new_work = env.event()
+                yield self._new_work
+            finish_time = self._heap[0][0]
+            if finish_time > env.now:
+                # Wake early if new work arrives, in case it is due sooner.
+                self._new_work = env.event()
+                yield env.timeout(finish_time - env.now) | self._new_work
+                continue
+            while self._heap and self._heap[0][0] <= env.now:
+                _, entity, batch_event = heapq.heappop(self._heap)
+                self.entity_cleanup(entity, component_manager)
+                if not batch_event.triggered:
+                    batch_event.succeed()
+
+    def entity_cleanup(self, entity: int, component_manager: ComponentManager):
         """
         Commands for changing entity's components upon command completion.
         """
-        yield triggered_event
-        self.update_position(
-            position_component=components.get(Position),
-            command=components.get(ExecutingCommand).command,
-        )
-        components.get(Commandable).state = CommandState.IDLING
-        component_manager.remove_components(entity, [ExecutingCommand])
-
-    def update_position(self, position_component: Position, command: MoveCommand):
-        """
-        Updates the position component.
-        """
-        position_component.x += command.delta_x
-        position_component.y += command.delta_y
+        components = component_manager.get_entity(entity)
+        commandable = components[Commandable]
+        position = components[Position]
+        position.x += commandable.pending_dx
+        position.y += commandable.pending_dy
+        commandable.state = IDLING
+        # Plain-object writes are invisible to the recorder otherwise.
+        component_manager.mark_dirty(entity)
 
 
 def run_quick_sim(until=100):
@@ -193,6 +218,12 @@ def run_quick_sim(until=100):
     # Instantiation of the examples.
     component_manager = ComponentManager()
 
+    # The hot components live in structure-of-arrays storage so their fields sit in contiguous
+    # arrays instead of being scattered across per-entity objects.
+    component_manager.register_soa(Position)
+    component_manager.register_soa(Destination)
+    component_manager.register_soa(Commandable, dtypes={"state": np.int8})
+
     for _ in range(1000):
         component_manager.new_entity(
             components=(Position(), Commandable(), Destination(x=10, y=10))
@@ -202,13 +233,14 @@ def run_quick_sim(until=100):
     exec_system = CommandExecutionSystem()
 
     world = World.make(
-        systems=[move_system, exec_system], component_manager=component_manager
+        systems=[move_system, exec_system],
+        component_manager=component_manager,
+        # Only the actual observables; the command fields ride along on Commandable.
+        record_types={Position, Commandable},
     )
 
     world.run(until)
-    world.recorder.to_polar_dataframe().to_pandas().to_parquet(
-        "./data/generated/sim_db.parquet"
-    )
+    world.recorder.write_parquet_direct("./data/generated/sim_db.parquet")
 
 
 if __name__ == "__main__":
@@ -3,75 +3,228 @@ Core running engine for a discrete-event simulation married to an entity-compone
 """
 
 import abc
+import array
+import collections
 import dataclasses
-import sqlite3
-from typing import Iterable, Iterator, TypeVar
+import enum
+from typing import Callable, Iterable, Iterator, TypeVar
 
+import numpy as np
 import polars as pl
 import simpy
 
 import util
 
 
-def id_generator() -> Iterator[int]:
+@dataclasses.dataclass(slots=True)
+class Component:
     """
-    Generator that just increments the entity count by one.
+    Base for all components.  Subclasses should also declare `slots=True` so instances carry no
+    per-object `__dict__`.
     """
-    id_counter = 0
-    while True:
-        yield id_counter
-        id_counter += 1
 
 
-@dataclasses.dataclass
-class Component:
+C = TypeVar("C", bound=Component)
+
+
+# Freelists of recycled instances, keyed by type.  Short-lived components that are added and
+# removed every tick churn the allocator and GC; recycling them through `acquire`/`release`
+# turns each cycle into a list pop plus slot assignments.
+_POOL: dict[type, list] = collections.defaultdict(list)
+
+
+def acquire(cls: type[C], **kwargs) -> C:
     """
-    Base for all components.
+    Returns an instance of the given class, reusing a released one if available.  Attributes are
+    assigned from the keyword arguments either way.
     """
+    pool = _POOL[cls]
+    if pool:
+        instance = pool.pop()
+        for name, value in kwargs.items():
+            setattr(instance, name, value)
+        return instance
+    return cls(**kwargs)
 
 
-C = TypeVar("C", bound=Component)
+def release(instance) -> None:
+    """
+    Returns an instance to its type's freelist for later reuse by `acquire`.  The caller must not
+    keep references to a released instance.
+    """
+    _POOL[type(instance)].append(instance)
 
 
-class ComponentDict:
+class ComponentDict(dict):
     """
-    Convenience wrapper around a dictionary that can be queried for component types.  Mostly useful
-    for type-hinting purposes.
+    A plain `dict` from component type to component instance.  Subclassing `dict` directly (rather
+    than wrapping one) means component access is a single dictionary lookup with no intermediate
+    attribute chase; the class exists mostly for type-hinting purposes.
     """
 
-    def __init__(self, data: dict[type[C], C] | None = None) -> None:
-        self.data = data or {}
-
-    def get(self, c_type: type[C]) -> C:
-        """
-        Gets a component of the given type, if one exists, raises `KeyError` otherwise.
-        """
-        return self.data[c_type]
+    __slots__ = ()
 
     def add(self, component: C) -> None:
         """
         Adds a new component.  If one already exists, it is overwritten.
         """
-        self.data[type(component)] = component
+        self[type(component)] = component
 
-    def components(self) -> Iterable[type[Component]]:
-        """
-        Return all component types currently in the dictionary.
-        """
-        return self.data.keys()
 
-    def pop(self, component_type: type[C]) -> C:
+class SoaStorage:
+    """
+    Structure-of-arrays backing store for one component type.  Each field of the component lives
+    in its own contiguous NumPy array indexed by a dense "slot"; entity IDs map to slots through
+    `slot_of`.  Hot systems can operate on the raw arrays directly, while existing attribute-style
+    access keeps working through a generated proxy class whose properties read and write the
+    arrays in place.
+    """
+
+    # FP32 by default: component fields here are game-scale quantities, and halving the bytes
+    # moved through cache doubles the effective bandwidth of the vectorized systems.  Callers
+    # needing a different precision can override per field via `dtypes`.
+    _DEFAULT_DTYPE = np.float32
+
+    def __init__(
+        self,
+        c_type: type[Component],
+        dtypes: dict[str, np.dtype] | None = None,
+        capacity: int = 1024,
+        dirty: set[int] | None = None,
+    ) -> None:
+        self.c_type = c_type
+        # Entities mutated through proxy writes are reported here (the manager shares its dirty
+        # set), so changed entities can be recorded without scanning everything.
+        self.dirty = dirty if dirty is not None else set()
+        self.field_names = tuple(
+            field.name for field in dataclasses.fields(c_type)
+        )
+        self.enum_types: dict[str, type[enum.Enum]] = {}
+        for field in dataclasses.fields(c_type):
+            if isinstance(field.type, type) and issubclass(field.type, enum.Enum):
+                self.enum_types[field.name] = field.type
+        dtypes = dtypes or {}
+        self.arrays: dict[str, np.ndarray] = {
+            name: np.zeros(
+                capacity,
+                dtypes.get(name, np.int8 if name in self.enum_types else self._DEFAULT_DTYPE),
+            )
+            for name in self.field_names
+        }
+        self.slot_of: dict[int, int] = {}
+        self.entity_at: list[int] = []
+        self.proxy_type = self._make_proxy_type()
+
+    def __len__(self) -> int:
+        return len(self.entity_at)
+
+    def add(self, entity_id: int, component: Component) -> Component:
+        """
+        Copies the component's field values into the arrays and returns a proxy bound to the
+        entity's slot.
+        """
+        slot = self.slot_of.get(entity_id)
+        if slot is None:
+            slot = len(self.entity_at)
+            if slot == len(self.arrays[self.field_names[0]]):
+                self._grow()
+            self.slot_of[entity_id] = slot
+            self.entity_at.append(entity_id)
+        for name in self.field_names:
+            value = getattr(component, name)
+            if name in self.enum_types:
+                value = value.value
+            self.arrays[name][slot] = value
+        return self.proxy_type(self, entity_id)
+
+    def remove(self, entity_id: int) -> None:
+        """
+        Frees the entity's slot, swapping the last occupied slot into its place so the arrays
+        stay dense.
+        """
+        slot = self.slot_of.pop(entity_id)
+        last_entity = self.entity_at.pop()
+        if last_entity != entity_id:
+            last_slot = len(self.entity_at)
+            for array in self.arrays.values():
+                array[slot] = array[last_slot]
+            self.slot_of[last_entity] = slot
+            self.entity_at[slot] = last_entity
+
+    def entity_array(self) -> np.ndarray:
+        """
+        Returns the entity IDs occupying slots 0..len, aligned with the field arrays.
+        """
+        return np.fromiter(
+            self.entity_at, dtype=np.int64, count=len(self.entity_at)
+        )
+
+    def slots_for(self, entity_ids: Iterable[int]) -> np.ndarray:
         """
-        Pops the given component type.
+        Returns the dense slot indices for the given entities, suitable for fancy-indexing the
+        field arrays.
         """
-        return self.data.pop(component_type)
+        slot_of = self.slot_of
+        return np.fromiter(
+            (slot_of[entity_id] for entity_id in entity_ids), dtype=np.intp
+        )
+
+    def _grow(self) -> None:
+        for name, array in self.arrays.items():
+            grown = np.zeros(2 * len(array), array.dtype)
+            grown[: len(array)] = array
+            self.arrays[name] = grown
 
-    def items(self) -> Iterator[tuple[type[Component], Component]]:
+    def _make_proxy_type(self) -> type:
         """
-        Iterates over entries in the dict.
+        Builds a view class exposing the component's fields as properties over the arrays.  The
+        class carries the original `__dataclass_fields__` so it records through
+        `util.dataclass_to_dict` exactly like the component it stands in for.
         """
-        for key, value in self.data.items():
-            yield key, value
+        namespace = {
+            "__slots__": ("_storage", "_entity"),
+            "__dataclass_fields__": self.c_type.__dataclass_fields__,
+            "__init__": _proxy_init,
+        }
+        for name in self.field_names:
+            namespace[name] = self._make_proxy_property(name)
+        return type(self.c_type.__name__, (), namespace)
+
+    def _make_proxy_property(self, name: str) -> property:
+        # Access goes through the proxy's storage rather than a captured array so the `_grow`
+        # reallocations stay visible.
+        enum_type = self.enum_types.get(name)
+
+        if enum_type is not None:
+
+            def getter(proxy):
+                storage = proxy._storage
+                return enum_type(
+                    int(storage.arrays[name][storage.slot_of[proxy._entity]])
+                )
+
+            def setter(proxy, value):
+                storage = proxy._storage
+                storage.arrays[name][storage.slot_of[proxy._entity]] = value.value
+                storage.dirty.add(proxy._entity)
+
+        else:
+
+            def getter(proxy):
+                storage = proxy._storage
+                return storage.arrays[name][storage.slot_of[proxy._entity]].item()
+
+            def setter(proxy, value):
+                storage = proxy._storage
+                storage.arrays[name][storage.slot_of[proxy._entity]] = value
+                storage.dirty.add(proxy._entity)
+
+        return property(getter, setter)
+
+
+def _proxy_init(proxy, storage: SoaStorage, entity_id: int) -> None:
+    proxy._storage = storage
+    proxy._entity = entity_id
 
 
 @dataclasses.dataclass
@@ -83,33 +236,139 @@ class ComponentManager:
         Maps from an integer ID to a dict from `ComponentType` to `Component`s that the entity
         contains.
     component_type_to_entities:
-        Maps from a `ComponentType` to a set of entity IDs that have this component type.
+        Maps from a `ComponentType` to a pair of (entity ID list, entity ID -> list index).  The
+        list gives cache-friendly linear iteration and the index dict gives O(1) membership tests
+        and swap-with-last removal, which together beat set mutation and hash probing in the hot
+        paths.
     """
 
     entity_to_components: dict[int, ComponentDict] = dataclasses.field(
         default_factory=lambda: {}
     )
-    type_to_entities: dict[type[Component], set[int]] = dataclasses.field(
+    type_to_entities: dict[type[Component], tuple[list[int], dict[int, int]]] = (
+        dataclasses.field(default_factory=lambda: {})
+    )
+
+    # The next entity ID to hand out.  A plain per-instance counter: incrementing it is cheaper
+    # than resuming a generator, and the previous class-level generator was shared across all
+    # manager instances.
+    _next_id: int = 0
+
+    # Cached query results, keyed by component-type signature.  Each entry stores the matching
+    # entities alongside the sum of the relevant type versions at computation time, so stale
+    # entries are detected without any bookkeeping on the query side.
+    _query_cache: dict[frozenset[type[Component]], tuple[list[int], int]] = (
+        dataclasses.field(default_factory=lambda: {})
+    )
+    _version: dict[type[Component], int] = dataclasses.field(
+        default_factory=lambda: {}
+    )
+
+    # Structure-of-arrays backing stores for component types registered via `register_soa`.
+    _soa: dict[type[Component], SoaStorage] = dataclasses.field(
         default_factory=lambda: {}
     )
 
-    # A generator for entity IDs.
-    _entity_id_generator: Iterator[int] = id_generator()
+    # Entities whose components changed since the dirty set was last cleared.  Mutating methods
+    # and SoA proxy writes populate it; the recording pass consumes it.
+    _dirty_entities: set[int] = dataclasses.field(default_factory=lambda: set())
+
+    def _bump_version(self, c_type: type[Component]) -> None:
+        """
+        Marks queries involving the given component type as stale.
+        """
+        self._version[c_type] = self._version.get(c_type, 0) + 1
+
+    def register_soa(
+        self,
+        c_type: type[Component],
+        dtypes: dict[str, np.dtype] | None = None,
+    ) -> SoaStorage:
+        """
+        Registers a component type for structure-of-arrays storage.  From then on the entity
+        dictionaries hold proxies whose fields live in the storage's contiguous arrays; any
+        entities that already carry the component are migrated in place.
+        """
+        storage = self._soa[c_type] = SoaStorage(
+            c_type, dtypes=dtypes, dirty=self._dirty_entities
+        )
+        for entity_id in self.type_to_entities.get(c_type, ([], {}))[0]:
+            component_dict = self.entity_to_components[entity_id]
+            component_dict[c_type] = storage.add(entity_id, component_dict[c_type])
+        return storage
+
+    def get_soa(self, c_type: type[Component]) -> SoaStorage:
+        """
+        Returns the structure-of-arrays storage for the given component type, for systems that
+        want to operate on the raw arrays.
+        """
+        return self._soa[c_type]
+
+    def soa_items(self) -> Iterator[tuple[type[Component], SoaStorage]]:
+        """
+        Iterates over (component type, storage) pairs for all SoA-registered types.
+        """
+        return iter(self._soa.items())
+
+    def mark_dirty(self, entity_id: int) -> None:
+        """
+        Marks an entity as changed for the next recording pass.  Writes through SoA proxies mark
+        this automatically; code mutating plain component objects in place must call it itself,
+        or the change is invisible to the dirty-only recording in `World.loop`.
+        """
+        self._dirty_entities.add(entity_id)
+
+    def dirty_entities(self) -> set[int]:
+        """
+        The entities whose components have changed since `clear_dirty` was last called.
+        """
+        return self._dirty_entities
+
+    def clear_dirty(self) -> None:
+        """
+        Resets the dirty-entity tracking, typically after a recording pass.
+        """
+        self._dirty_entities.clear()
+
+    def _attach_component(self, entity_id: int, component: Component) -> None:
+        """
+        Stores a component for an entity, routing it into structure-of-arrays storage when its
+        type is registered there.
+        """
+        c_type = type(component)
+        storage = self._soa.get(c_type)
+        if storage is not None:
+            component = storage.add(entity_id, component)
+        self.entity_to_components[entity_id][c_type] = component
+        entities, index_of = self.type_to_entities.setdefault(c_type, ([], {}))
+        if entity_id not in index_of:
+            index_of[entity_id] = len(entities)
+            entities.append(entity_id)
+        self._dirty_entities.add(entity_id)
+        self._bump_version(c_type)
+
+    def _detach_entity(self, entity_id: int, c_type: type[Component]) -> None:
+        """
+        Removes an entity from a component type's membership via swap-with-last, keeping the
+        entity list dense.
+        """
+        entities, index_of = self.type_to_entities[c_type]
+        index = index_of.pop(entity_id)
+        last = entities.pop()
+        if index < len(entities):
+            entities[index] = last
+            index_of[last] = index
 
     def new_entity(self, components: Iterable[Component] | None) -> int:
         """
         Create a new entity with the given `Component`s.
         """
-        entity_id = next(self._entity_id_generator)
+        entity_id = self._next_id
+        self._next_id += 1
         self.entity_to_components[entity_id] = ComponentDict()
         if components is not None:
             for component in components:
-                c_type = type(component)
-                self.entity_to_components[entity_id].add(component)
-                if c_type not in self.type_to_entities:
-                    self.type_to_entities[c_type] = {entity_id}
-                else:
-                    self.type_to_entities[c_type].add(entity_id)
+                self._attach_component(entity_id, component)
         return entity_id
 
     def remove_entity(self, entity_id: int) -> None:
@@ -118,8 +377,11 @@ class ComponentManager:
         """
         # Remove entity ID from entity dictionary.
         component_dict = self.entity_to_components.pop(entity_id)
-        for c_type in component_dict.components():
-            self.type_to_entities[c_type].remove(entity_id)
+        for c_type in component_dict:
+            self._detach_entity(entity_id, c_type)
+            if c_type in self._soa:
+                self._soa[c_type].remove(entity_id)
+            self._bump_version(c_type)
 
     def get_entity(self, entity_id: int) -> ComponentDict:
         """
@@ -141,12 +403,7 @@ class ComponentManager:
         exists, it is replaced.
         """
         for component in components:
-            c_type = type(component)
-            self.entity_to_components[entity_id].add(component)
-            if c_type not in self.type_to_entities:
-                self.type_to_entities[c_type] = {entity_id}
-            else:
-                self.type_to_entities[c_type].add(entity_id)
+            self._attach_component(entity_id, component)
 
     def remove_components(
         self, entity_id: int, component_types: Iterable[type[Component]]
@@ -156,8 +413,93 @@ class ComponentManager:
         not have a component of the given type, raises a `KeyError`.
         """
         for c_type in component_types:
-            self.type_to_entities[c_type].remove(entity_id)
-            self.entity_to_components[entity_id].pop(c_type)
+            self._detach_entity(entity_id, c_type)
+            component = self.entity_to_components[entity_id].pop(c_type)
+            if c_type in self._soa:
+                self._soa[c_type].remove(entity_id)
+            else:
+                # SoA proxies are rebuilt on attach, so only plain components are recycled.
+                release(component)
+            self._dirty_entities.add(entity_id)
+            self._bump_version(c_type)
+
+    def query_entities(
+        self, component_types: Iterable[type[Component]]
+    ) -> tuple[list[int], int]:
+        """
+        Returns the entities matching the given component types along with the query's version.
+        Results are cached per signature and only recomputed when one of the requested types has
+        gained or lost entities since the last call; callers may use the version to cache their
+        own derived data (e.g. slot index arrays).
+        """
+        key = frozenset(component_types)
+        version_sum = sum(self._version.get(c_type, 0) for c_type in key)
+        cached = self._query_cache.get(key)
+        if cached is None or cached[1] != version_sum:
+            cached = self._recompute_query(key, version_sum)
+        return cached
+
+    def _recompute_query(
+        self, key: frozenset[type[Component]], version_sum: int
+    ) -> tuple[list[int], int]:
+        """
+        Recomputes and caches the entity list for a query signature.
+        """
+        try:
+            groups = [self.type_to_entities[c_type] for c_type in key]
+        except KeyError:
+            # No entities registered with one or more component types.
+            entities = []
+        else:
+            # Scan the shortest membership list and filter by the other types' index dicts;
+            # this is a contiguous walk rather than set intersection.
+            groups.sort(key=lambda group: len(group[0]))
+            base = groups[0][0]
+            others = [index_of for _, index_of in groups[1:]]
+            entities = [
+                entity
+                for entity in base
+                if all(entity in index_of for index_of in others)
+            ]
+        cached = self._query_cache[key] = (entities, version_sum)
+        return cached
+
+    def make_query(
+        self, component_types: Iterable[type[Component]]
+    ) -> "Callable[[], Iterator[tuple[int, ComponentDict]]]":
+        """
+        Builds a query function specialized to the given component types via runtime code
+        generation.  The returned callable behaves like `get_components` for that signature, but
+        the signature key, version counters, and entity dictionary are bound once at build time,
+        so each call is a handful of dict lookups plus the iteration itself.
+        """
+        types = tuple(dict.fromkeys(component_types))
+        key = frozenset(types)
+        for c_type in types:
+            self._version.setdefault(c_type, 0)
+        version_sum_expr = " + ".join(
+            f"_version[_t{index}]" for index in range(len(types))
+        )
+        source = (
+            "def _query():\n"
+            f"    version_sum = {version_sum_expr}\n"
+            "    cached = _cache.get(_key)\n"
+            "    if cached is None or cached[1] != version_sum:\n"
+            "        cached = _recompute(_key, version_sum)\n"
+            "    for entity in cached[0]:\n"
+            "        yield entity, _entity_to_components[entity]\n"
+        )
+        namespace = {
+            "_cache": self._query_cache,
+            "_key": key,
+            "_version": self._version,
+            "_recompute": self._recompute_query,
+            "_entity_to_components": self.entity_to_components,
+        }
+        for index, c_type in enumerate(types):
+            namespace[f"_t{index}"] = c_type
+        exec(source, namespace)  # pylint: disable=exec-used
+        return namespace["_query"]
 
     def get_components(
         self, component_types: Iterable[type[Component]]
@@ -166,22 +508,61 @@ class ComponentManager:
         Returns an iterator over pairs of entity, dicts of components for entities that match the
         given component types.
         """
-        try:
-            for entity in set.intersection(
-                *[self.type_to_entities[c_type] for c_type in component_types]
-            ):
-                yield entity, self.get_entity(entity)
-        except KeyError:
-            # No entities registered with one or more component types.
-            pass
+        entities, _ = self.query_entities(component_types)
+        for entity in entities:
+            yield entity, self.get_entity(entity)
 
 
 # Here, we tie the event-triggered nature of `simpy` to the `System` class.
-class System(abc.ABC):  # pylint: disable=too-few-public-methods
+class System(abc.ABC):
     """
     A base system has an `update` method that operates on the entire ECS.
     """
 
+    required_components: tuple[type[Component], ...] = ()
+
+    def __init__(self) -> None:
+        self._query: Callable[[], Iterator[tuple[int, ComponentDict]]] | None = None
+        # Slot index arrays derived from the query, rebuilt only when the query's version
+        # changes (i.e. when entities gain or lose one of the required components).
+        self._slots_version: int | None = None
+        self._slots_entities: list[int] = []
+        self._slots_entity_array: np.ndarray = np.empty(0, dtype=np.int64)
+        self._slots: dict[type[Component], np.ndarray] = {}
+
+    def query_slots(
+        self, component_manager: ComponentManager
+    ) -> tuple[list[int], np.ndarray, dict[type[Component], np.ndarray]]:
+        """
+        Returns (entity list, entity ID array, slot-index arrays keyed by component type) for
+        this system's query, for vectorized updates over the SoA arrays.  Cached against the
+        query version; raises `KeyError` if a required type is not SoA-registered.
+        """
+        entities, version = component_manager.query_entities(self.required_components)
+        if version != self._slots_version:
+            self._slots = {
+                c_type: component_manager.get_soa(c_type).slots_for(entities)
+                for c_type in self.required_components
+            }
+            self._slots_entities = entities
+            self._slots_entity_array = np.fromiter(
+                entities, dtype=np.int64, count=len(entities)
+            )
+            self._slots_version = version
+        return self._slots_entities, self._slots_entity_array, self._slots
+
+    def iter_components(
+        self, component_manager: ComponentManager
+    ) -> Iterator[tuple[int, ComponentDict]]:
+        """
+        Iterates over entities matching `required_components`, through a query specialized to this
+        system's signature.  The specialized query is built on first use, since systems are
+        typically constructed before the `ComponentManager` is known.
+        """
+        if self._query is None:
+            self._query = component_manager.make_query(self.required_components)
+        return self._query()
+
     @abc.abstractmethod
     def update(
         self, env: simpy.Environment, component_manager: ComponentManager
@@ -193,82 +574,207 @@ class System(abc.ABC):  # pylint: disable=too-few-public-methods
         """
 
 
+# Component class names interned once per type; the recorder resolves thousands of these per
+# tick, so even the type -> __name__ attribute read is worth caching.
+_NAME_CACHE: dict[type, str] = {}
+
+
 @dataclasses.dataclass
 class Recorder:
     """
-    Database connection for the simulation.
+    In-memory columnar store for the simulation records.  Rows are appended to homogeneous
+    `array.array` buffers (no per-value Python object survives recording) and only materialized
+    into a polars dataframe on demand; this drops the SQL statement formatting, per-row binding,
+    and B-tree inserts of the previous SQLite backend, whose output was converted to polars
+    anyway.  The component and attribute columns only ever take a handful of distinct values, so
+    they are interned as small integer IDs and mapped back to strings at dataframe construction.
+    Recorded attribute values must be numeric.
     """
 
-    db: sqlite3.Connection
-    db_path: str
-    db_name: str
+    timestamps: array.array
+    entities: array.array
+    component_ids: array.array
+    attribute_ids: array.array
+    values: array.array
     is_open: bool
+    # Component types to record; `None` records everything.  Transient plumbing components can
+    # be filtered out here to keep the output to actual observables.
+    record_types: set[type] | None
+    _component_names: list[str] = dataclasses.field(default_factory=lambda: [])
+    _component_id_of: dict[str, int] = dataclasses.field(default_factory=lambda: {})
+    _attribute_names: list[str] = dataclasses.field(default_factory=lambda: [])
+    _attribute_id_of: dict[str, int] = dataclasses.field(default_factory=lambda: {})
+    # Hash of each (entity, component type)'s last recorded values, so unchanged components are
+    # not recorded again.
+    _last_hash: dict[tuple[int, type], int] = dataclasses.field(
+        default_factory=lambda: {}
+    )
+    # Columnar chunks from `record_soa`, one (timestamps, entities, component, attribute, values)
+    # tuple per recorded array slice.
+    _soa_chunks: list[tuple[np.ndarray, np.ndarray, str, str, np.ndarray]] = (
+        dataclasses.field(default_factory=lambda: [])
+    )
 
     @classmethod
-    def make(cls, db_path: str, db_name: str = "sim_records"):
+    def make(cls, record_types: set[type] | None = None):
         """
-        Holds records within a database using SQlite3.
+        Makes a new instance with empty columns, recording only the given component types (or
+        everything, if none are given).
         """
-        try:
-            db = sqlite3.connect(db_path)
-            db.execute(f"DROP TABLE IF EXISTS {db_name}")
-            db.execute(
-                f"CREATE TABLE {db_name} "
-                f"(timestamp FLOAT, "
-                f"entity INT, "
-                f"component TEXT, "
-                f"attribute TEXT, "
-                f"value)"
-            )
-            return cls(db=db, db_path=db_path, db_name=db_name, is_open=True)
-        except Exception as e:
-            raise ConnectionError("Could not connect to records database!") from e
+        return cls(
+            timestamps=array.array("d"),
+            entities=array.array("q"),
+            component_ids=array.array("H"),
+            attribute_ids=array.array("H"),
+            values=array.array("d"),
+            is_open=True,
+            record_types=record_types,
+        )
 
     def close_db(self):
         """
-        Closes the database connection.
+        Finalizes recording; further records are not expected after this.
         """
-        self.db.commit()
-        self.db.close()
         self.is_open = False
 
+    @staticmethod
+    def _intern(name: str, names: list[str], id_of: dict[str, int]) -> int:
+        interned = id_of.get(name)
+        if interned is None:
+            interned = id_of[name] = len(names)
+            names.append(name)
+        return interned
+
     def record_component(self, time: float, entity: int, component: Component):
         """
-        Add information to the running simulation records.
-
-        Args:
-            state:
-                Dictionary of values to save in the records.
-            prefix:
-                The string prefix (key) to put this entry in within the simulation records.  If none
-                is given, the value is recorded at the top 'SIM' prefix.
-        """
-        for attribute, value in util.dataclass_to_dict(component).items():
-            self.db.execute(
-                f"INSERT INTO {self.db_name} (timestamp, entity, component, attribute, value) "
-                f"VALUES "
-                f"(?, ?, ?, ?, ?)",
-                (
-                    time,
-                    entity,
-                    str(type(component).__name__),
-                    attribute,
-                    value,
-                ),
+        Add information to the running simulation records.  Components whose values have not
+        changed since they were last recorded are skipped.
+        """
+        values = util.dataclass_to_dict(component)
+        c_type = type(component)
+        key = (entity, c_type)
+        value_hash = hash(tuple(values.values()))
+        if self._last_hash.get(key) == value_hash:
+            return
+        self._last_hash[key] = value_hash
+        component_name = _NAME_CACHE.get(c_type) or _NAME_CACHE.setdefault(
+            c_type, str(c_type.__name__)
+        )
+        component_id = self._intern(
+            component_name, self._component_names, self._component_id_of
+        )
+        for attribute, value in values.items():
+            try:
+                numeric = float(value)
+            except (TypeError, ValueError) as error:
+                raise TypeError(
+                    f"Cannot record {component_name}.{attribute}={value!r}: recorded "
+                    "attribute values must be numeric"
+                ) from error
+            self.timestamps.append(time)
+            self.entities.append(entity)
+            self.component_ids.append(component_id)
+            self.attribute_ids.append(
+                self._intern(attribute, self._attribute_names, self._attribute_id_of)
+            )
+            self.values.append(numeric)
+
+    def record_soa(
+        self,
+        time: float,
+        entity_ids: np.ndarray,
+        component_name: str,
+        attribute: str,
+        values: np.ndarray,
+    ):
+        """
+        Record one attribute for a whole slice of entities at once.  The values array is snapshot
+        with a single vectorized copy instead of a per-entity Python loop.
+        """
+        self._soa_chunks.append(
+            (
+                np.full(len(entity_ids), time),
+                entity_ids,
+                component_name,
+                attribute,
+                values.astype(np.float64),
             )
+        )
 
     def to_polar_dataframe(self):
         """
-        Converts the current database to a polars dataframe.
+        Converts the current records to a polars dataframe.
+        """
+        frames = []
+        if len(self.timestamps):
+            # The buffers expose the buffer protocol, so numpy wraps them without copying and
+            # polars builds the series straight from the resulting arrays.
+            component_names = np.array(self._component_names, dtype=object)
+            attribute_names = np.array(self._attribute_names, dtype=object)
+            frames.append(
+                pl.DataFrame(
+                    {
+                        "timestamp": np.frombuffer(self.timestamps, dtype=np.float64),
+                        "entity": np.frombuffer(self.entities, dtype=np.int64),
+                        "component": component_names[
+                            np.frombuffer(self.component_ids, dtype=np.uint16)
+                        ],
+                        "attribute": attribute_names[
+                            np.frombuffer(self.attribute_ids, dtype=np.uint16)
+                        ],
+                        "value": np.frombuffer(self.values, dtype=np.float64),
+                    }
+                )
+            )
+        if self._soa_chunks:
+            frames.append(
+                pl.DataFrame(
+                    {
+                        "timestamp": np.concatenate(
+                            [chunk[0] for chunk in self._soa_chunks]
+                        ),
+                        "entity": np.concatenate(
+                            [chunk[1] for chunk in self._soa_chunks]
+                        ),
+                        "component": np.concatenate(
+                            [
+                                np.full(len(chunk[0]), chunk[2], dtype=object)
+                                for chunk in self._soa_chunks
+                            ]
+                        ),
+                        "attribute": np.concatenate(
+                            [
+                                np.full(len(chunk[0]), chunk[3], dtype=object)
+                                for chunk in self._soa_chunks
+                            ]
+                        ),
+                        "value": np.concatenate(
+                            [chunk[4] for chunk in self._soa_chunks]
+                        ),
+                    }
+                )
+            )
+        if not frames:
+            return pl.DataFrame(
+                schema={
+                    "timestamp": pl.Float64,
+                    "entity": pl.Int64,
+                    "component": pl.Utf8,
+                    "attribute": pl.Utf8,
+                    "value": pl.Float64,
+                }
+            )
+        if len(frames) == 1:
+            return frames[0]
+        return pl.concat(frames)
+
+    def write_parquet_direct(self, path: str):
         """
-        if not self.is_open:
-            db = sqlite3.connect(self.db_path)
-            df = pl.read_database(query=f"SELECT * FROM {self.db_name}", connection=db)
-            db.close()
-            return df
-        return pl.read_database(
-            query=f"SELECT * FROM {self.db_name}", connection=self.db
-        )
+        Writes the records straight to a Parquet file.  The dataframe is assembled from the
+        columnar buffers in one shot and polars writes Parquet natively, so no pandas (or
+        SQLite) intermediate is involved.
+        """
+        self.to_polar_dataframe().write_parquet(path)
 
 
 @dataclasses.dataclass
@@ -281,6 +787,10 @@ class World:
     systems: list[System]
     component_manager: ComponentManager
     recorder: Recorder
+    # The single event the loop waits on each iteration.  System events succeed it through
+    # `_wake` instead of the loop building a fresh `any_of` condition (which copies the event
+    # list and allocates a condition object) every iteration.
+    _tick_event: simpy.Event | None = None
 
     @classmethod
     def make(
@@ -288,6 +798,7 @@ class World:
         env: simpy.Environment | None = None,
         systems: list[System] | None = None,
         component_manager: ComponentManager | None = None,
+        record_types: set[type] | None = None,
     ):
         """
         Makes a new instance.
@@ -296,9 +807,7 @@ class World:
             env=env or simpy.Environment(),
             systems=systems or [],
             component_manager=component_manager or ComponentManager(),
-            recorder=Recorder.make(
-                db_path="./data/generated/sim_db.sqlite", db_name="sim_records"
-            ),
+            recorder=Recorder.make(record_types=record_types),
         )
 
     def run(self, until: float):
@@ -313,6 +822,7 @@ class World:
         """
         Main simulation loop.  Systems are iterated any time an event is triggered.
         """
+        self._tick_event = self.env.event()
         while True:
             shared_events = []
 
@@ -321,12 +831,64 @@ class World:
                 if event:
                     shared_events.append(event)
 
-            for entity, components in self.component_manager.get_entities():
-                for _, component in components.items():
-                    self.recorder.record_component(
-                        time=self.env.now, entity=entity, component=component
+            now = self.env.now
+            manager = self.component_manager
+
+            # Only entities that changed since the last pass are recorded.  SoA-registered types
+            # dump their dirty slots as array slices; the remaining object-backed components take
+            # the per-entity path.
+            dirty = manager.dirty_entities()
+            if dirty:
+                record_types = self.recorder.record_types
+                soa_types = set()
+                for c_type, storage in manager.soa_items():
+                    soa_types.add(c_type)
+                    if record_types is not None and c_type not in record_types:
+                        continue
+                    slot_of = storage.slot_of
+                    changed = [entity for entity in dirty if entity in slot_of]
+                    if not changed:
+                        continue
+                    entity_ids = np.fromiter(
+                        changed, dtype=np.int64, count=len(changed)
                     )
+                    slots = storage.slots_for(changed)
+                    component_name = c_type.__name__
+                    for attribute, array in storage.arrays.items():
+                        self.recorder.record_soa(
+                            now, entity_ids, component_name, attribute, array[slots]
+                        )
+
+                entity_to_components = manager.entity_to_components
+                for entity in dirty:
+                    components = entity_to_components.get(entity)
+                    if components is None:
+                        # Removed since it was marked dirty.
+                        continue
+                    for c_type, component in components.items():
+                        if c_type in soa_types or (
+                            record_types is not None and c_type not in record_types
+                        ):
+                            continue
+                        self.recorder.record_component(
+                            time=now, entity=entity, component=component
+                        )
+                manager.clear_dirty()
             if shared_events:
-                yield self.env.any_of(shared_events)
+                for event in shared_events:
+                    if event.callbacks is not None:
+                        event.callbacks.append(self._wake)
+                    else:
+                        # Already processed; wake immediately.
+                        self._wake(event)
+                yield self._tick_event
+                self._tick_event = self.env.event()
             else:
                 break
+
+    def _wake(self, _event: simpy.Event) -> None:
+        """
+        Succeeds the current tick event, prompting another iteration of the main loop.
+        """
+        if not self._tick_event.triggered:
+            self._tick_event.succeed()
@@ -5,23 +5,73 @@ Simple utilities.
 import dataclasses
 import enum
 import json
+import operator
+from typing import Any, Callable
 
 import pint
 
 UNITS = pint.UnitRegistry()
 
+# Per-type converters built once by `_make_dictifier` and reused on every subsequent call.
+_DICTIFIERS: dict[type, Callable[[Any], dict]] = {}
+
+# Field-name tuples resolved once per dataclass type; `dataclasses.fields` walks the class dict
+# on every call, so anything touching fields in a hot path should go through this cache.
+_FIELDS: dict[type, tuple[str, ...]] = {}
+
+
+def field_names(cls: type) -> tuple[str, ...]:
+    """
+    Returns the dataclass field names for the given type, cached per type.
+    """
+    names = _FIELDS.get(cls)
+    if names is None:
+        names = _FIELDS[cls] = tuple(
+            field.name for field in dataclasses.fields(cls)
+        )
+    return names
+
+
+def _encode(value):
+    """
+    Encode a single field value for a flat dictionary.  Nested dataclasses and dicts become JSON
+    blobs, enums become their numeric values (matching the int codes that SoA storage records
+    for enum fields), everything else passes through unchanged.
+    """
+    if isinstance(value, enum.Enum):
+        return value.value
+    if dataclasses.is_dataclass(value):
+        return json.dumps(dataclass_to_dict(value))
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+def _make_dictifier(cls: type) -> Callable[[Any], dict]:
+    """
+    Build a converter for the given dataclass type.  Field names and accessors are resolved once
+    per type, which avoids the recursive deepcopy that `dataclasses.asdict` performs on every call.
+    """
+    names = field_names(cls)
+    if not names:
+        return lambda data: {}
+    if len(names) == 1:
+        getter = operator.attrgetter(names[0])
+        name = names[0]
+        return lambda data: {name: _encode(getter(data))}
+    getters = operator.attrgetter(*names)
+    return lambda data: {
+        name: _encode(value) for name, value in zip(names, getters(data))
+    }
+
 
 def dataclass_to_dict(data):
     """
     Convert a dataclass object into a dictionary.  Converts any nested dataclasses or dicts into
     JSON blobs.
     """
-    base_object = dataclasses.asdict(data)
-    for name, value in base_object.items():
-        if dataclasses.is_dataclass(value):
-            base_object[name] = json.dumps(dataclass_to_dict(value))
-        elif isinstance(value, dict):
-            base_object[name] = json.dumps(value)
-        elif isinstance(value, enum.Enum):
-            base_object[name] = value.name
-    return base_object
+    cls = type(data)
+    dictifier = _DICTIFIERS.get(cls)
+    if dictifier is None:
+        dictifier = _DICTIFIERS[cls] = _make_dictifier(cls)
+    return dictifier(data)